@@ -1,7 +1,9 @@
 """Configuration management for indoor highlights processing."""
 
 import os
+import tempfile
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -21,11 +23,18 @@ class Config:
     csv_directory: str = "data"
     output_filename: str = "final_video.mp4"
     full_video_filename: str = "full_video.mp4"
+    staging_directory: str = tempfile.gettempdir()  # Local disk for in-progress outputs
 
     # Video settings
-    video_codec: str = "libx264"
+    ffmpeg_binary: str = "ffmpeg"
+    ffprobe_binary: str = "ffprobe"
+    video_codec: str = "auto"  # "auto" picks a hardware H.264 encoder if ffmpeg has one
+    video_bitrate: str = "8M"  # Used by hardware encoders, which have no CRF presets
     audio_codec: str = "aac"
     save_full_video: bool = True  # Whether to save the full uncut video
+    reencode_highlights: bool = False  # Re-encode segments instead of stream copy
+    encode_workers: int = max(1, (os.cpu_count() or 2) // 2)  # Parallel segment encodes
+    mp4_movflags: str = "+faststart"  # Output muxer flags; empty to leave moov at the end
 
     # YouTube settings
     youtube_default_privacy: str = "unlisted"
@@ -41,9 +50,19 @@ class Config:
             csv_directory=os.getenv("CSV_DIRECTORY", "data"),
             output_filename=os.getenv("OUTPUT_FILENAME", "final_video.mp4"),
             full_video_filename=os.getenv("FULL_VIDEO_FILENAME", "full_video.mp4"),
-            video_codec=os.getenv("VIDEO_CODEC", "libx264"),
+            staging_directory=os.getenv("STAGING_DIRECTORY", tempfile.gettempdir()),
+            # IMAGEIO_FFMPEG_EXE is still honoured from the MoviePy days
+            ffmpeg_binary=os.getenv(
+                "FFMPEG_BINARY", os.getenv("IMAGEIO_FFMPEG_EXE", "ffmpeg")
+            ),
+            ffprobe_binary=os.getenv("FFPROBE_BINARY", "ffprobe"),
+            video_codec=os.getenv("VIDEO_CODEC", "auto"),
+            video_bitrate=os.getenv("VIDEO_BITRATE", "8M"),
             audio_codec=os.getenv("AUDIO_CODEC", "aac"),
             save_full_video=os.getenv("SAVE_FULL_VIDEO", "true").lower() == "true",
+            reencode_highlights=os.getenv("REENCODE_HIGHLIGHTS", "false").lower() == "true",
+            encode_workers=int(os.getenv("ENCODE_WORKERS", max(1, (os.cpu_count() or 2) // 2))),
+            mp4_movflags=os.getenv("MP4_MOVFLAGS", "+faststart"),
             youtube_default_privacy=os.getenv("YOUTUBE_DEFAULT_PRIVACY", "unlisted"),
             youtube_default_tags=os.getenv("YOUTUBE_DEFAULT_TAGS", "indoor football,highlights,goals"),
         )
@@ -66,4 +85,9 @@ class Config:
         """Get output path for full uncut video."""
         if date:
             return os.path.join(self.base_directory, date, self.full_video_filename)
-        return self.full_video_filename
\ No newline at end of file
+        return self.full_video_filename
+
+    @cached_property
+    def excluded_filenames_lower(self) -> frozenset[str]:
+        """Lowercased output filenames to skip when discovering source videos."""
+        return frozenset({self.output_filename.lower(), self.full_video_filename.lower()})
@@ -11,6 +11,7 @@ DATE=""
 AUTO_MOVE=false
 SAVE_FULL_VIDEO=""
 SKIP_HIGHLIGHTS=false
+REENCODE=false
 
 # Function to show usage
 show_usage() {
@@ -23,6 +24,7 @@ show_usage() {
     echo "  --save-full-video     Save the full uncut video alongside highlights"
     echo "  --no-save-full-video  Don't save the full uncut video"
     echo "  --skip-highlights     Skip highlights creation and only produce the full video"
+    echo "  --reencode            Re-encode highlight segments for frame-accurate cuts"
     echo ""
     echo "Examples:"
     echo "  $0 --videos \"MAH02309.mp4,MAH02310.mp4,MAH02311.mp4\" --date 2025-07-28 --save-full-video"
@@ -61,6 +63,10 @@ while [[ $# -gt 0 ]]; do
             SKIP_HIGHLIGHTS=true
             shift
             ;;
+        --reencode)
+            REENCODE=true
+            shift
+            ;;
         -h|--help)
             show_usage
             exit 0
@@ -101,6 +107,10 @@ if [[ "$SKIP_HIGHLIGHTS" == true ]]; then
     CMD="$CMD --skip-highlights"
 fi
 
+if [[ "$REENCODE" == true ]]; then
+    CMD="$CMD --reencode"
+fi
+
 echo "Running: $CMD"
 echo ""
 
@@ -1,25 +1,34 @@
 """Batch process multiple date folders and optionally upload to YouTube."""
 
 import argparse
+import atexit
 import json
 import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-
 from config import Config
 
-load_dotenv()
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON for the upload state files
+    orjson = None
 
+# config.py loads the .env file on import
 config = Config.from_env()
 
-# State file for tracking uploads
+# State file for tracking uploads. STATE_FILE is a snapshot; uploads since the
+# last snapshot are appended to STATE_LOG as one JSON event per line.
 STATE_FILE = Path(__file__).parent.parent / "upload_state.json"
+STATE_LOG = Path(__file__).parent.parent / "upload_state.jsonl"
+COMPACT_EVERY = 50  # Fold the log into the snapshot after this many events
 
 # QUOTA PROTECTION
 # YouTube API: 10,000 units/day, each upload costs ~1,600 units
@@ -27,20 +36,67 @@ STATE_FILE = Path(__file__).parent.parent / "upload_state.json"
 MAX_UPLOADS_PER_RUN = 4  # Max videos to upload in a single run (2 dates worth)
 UPLOAD_WARNING_THRESHOLD = 6  # Warn when approaching daily limit
 
+# Folders processed concurrently by default (each runs its own ffmpeg)
+DEFAULT_JOBS = 2
+
+# Per-folder log for parallel runs, written into the date folder
+PROCESS_LOG_FILENAME = "process.log"
+
+# Keeps lines printed from worker threads whole
+_print_lock = threading.Lock()
 
-def load_upload_state() -> dict:
-    """Load upload state from JSON file."""
-    if STATE_FILE.exists():
-        with open(STATE_FILE) as f:
-            return json.load(f)
-    return {"_meta": {"uploads_today": 0, "last_upload_date": None}}
 
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-def get_uploads_today(state: dict) -> int:
-    """Get count of uploads done today."""
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def load_upload_state() -> dict:
+    """Load upload state from the JSON snapshot and replay the event log."""
+    # Read the snapshot once and parse the same buffer; a missing or empty
+    # file (e.g. truncated by a crash) means a fresh state
+    try:
+        raw = STATE_FILE.read_bytes()
+    except FileNotFoundError:
+        raw = b""
+    if raw.strip():
+        state = _json_loads(raw)
+    else:
+        state = {"_meta": {"uploads_today": 0, "last_upload_date": None}}
+
+    if STATE_LOG.exists():
+        with open(STATE_LOG, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = _json_loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-append
+                    break
+                _apply_upload_event(state, event)
+        # Fold events left by an interrupted run into the snapshot now, so new
+        # appends never follow a torn line
+        save_upload_state(state)
+        STATE_LOG.unlink()
+
+    return state
+
+
+def get_uploads_today(state: dict, today: str) -> int:
+    """Get count of uploads done today (today as YYYY-MM-DD)."""
     meta = state.get("_meta", {})
     last_date = meta.get("last_upload_date")
-    today = datetime.now().strftime("%Y-%m-%d")
 
     if last_date != today:
         # Reset counter for new day
@@ -48,26 +104,86 @@ def get_uploads_today(state: dict) -> int:
     return meta.get("uploads_today", 0)
 
 
-def increment_upload_count(state: dict) -> None:
-    """Increment today's upload counter."""
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    if "_meta" not in state:
-        state["_meta"] = {}
+def increment_upload_count(state: dict, today: str) -> None:
+    """Increment today's upload counter (today as YYYY-MM-DD)."""
+    meta = state.get("_meta", {})
 
-    if state["_meta"].get("last_upload_date") != today:
-        state["_meta"]["uploads_today"] = 1
-        state["_meta"]["last_upload_date"] = today
+    if meta.get("last_upload_date") != today:
+        uploads_today = 1
     else:
-        state["_meta"]["uploads_today"] = state["_meta"].get("uploads_today", 0) + 1
+        uploads_today = meta.get("uploads_today", 0) + 1
+
+    # Log the resulting count rather than "+1" so replaying is idempotent
+    append_upload_event(
+        state, {"event": "count", "date": today, "uploads_today": uploads_today}
+    )
 
-    save_upload_state(state)
+
+# State with events not yet folded into the snapshot (None when clean)
+_pending_state: dict | None = None
+_pending_events = 0
+
+
+def _apply_upload_event(state: dict, event: dict) -> None:
+    """Apply a single logged event to the in-memory state."""
+    if event["event"] == "upload":
+        state.setdefault(event["date"], {})[event["video_type"]] = {
+            "youtube_id": event["youtube_id"],
+            "uploaded_at": event["uploaded_at"],
+        }
+    elif event["event"] == "count":
+        meta = state.setdefault("_meta", {})
+        meta["uploads_today"] = event["uploads_today"]
+        meta["last_upload_date"] = event["date"]
+
+
+def append_upload_event(state: dict, event: dict) -> None:
+    """
+    Apply an event to state and append it to the upload log.
+
+    Each event is a ~100 byte append instead of a rewrite of the whole state
+    file; the log is folded into the snapshot every COMPACT_EVERY events and
+    by flush_upload_state().
+    """
+    global _pending_state, _pending_events
+    _apply_upload_event(state, event)
+
+    # No fsync here: closing the file hands the line to the OS, which survives
+    # a crash of this process; the fsync happens once per snapshot instead
+    with open(STATE_LOG, "ab") as f:
+        f.write(_json_dumps(event) + b"\n")
+
+    _pending_state = state
+    _pending_events += 1
+    if _pending_events >= COMPACT_EVERY:
+        flush_upload_state()
 
 
 def save_upload_state(state: dict) -> None:
-    """Save upload state to JSON file."""
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    """Write a full snapshot of upload state to the JSON file."""
+    # Write to a temp file, fsync it and swap it in, so a crash (or power loss)
+    # leaves either the old snapshot or the new one, never a truncated file
+    tmp_file = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(_json_dumps(state, indent=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, STATE_FILE)
+
+
+def flush_upload_state() -> None:
+    """Fold the upload log into the snapshot, if there are pending events."""
+    global _pending_state, _pending_events
+    if _pending_state is None:
+        return
+
+    save_upload_state(_pending_state)
+    STATE_LOG.unlink(missing_ok=True)
+    _pending_state = None
+    _pending_events = 0
+
+
+atexit.register(flush_upload_state)
 
 
 def is_video_uploaded(state: dict, date: str, video_type: str) -> bool:
@@ -77,57 +193,121 @@ def is_video_uploaded(state: dict, date: str, video_type: str) -> bool:
 
 def record_upload(state: dict, date: str, video_type: str, video_id: str) -> None:
     """Record a successful upload in state."""
-    if date not in state:
-        state[date] = {}
-    state[date][video_type] = {
-        "youtube_id": video_id,
-        "uploaded_at": datetime.now().isoformat(),
-    }
-    save_upload_state(state)
+    append_upload_event(
+        state,
+        {
+            "event": "upload",
+            "date": date,
+            "video_type": video_type,
+            "youtube_id": video_id,
+            "uploaded_at": datetime.now().isoformat(),
+        },
+    )
 
 
-def check_folder_status(date: str) -> dict:
-    """Check what exists in a date folder."""
-    date_folder = os.path.join(config.base_directory, date)
+@dataclass(frozen=True, slots=True)
+class DateFolder:
+    """Paths for one date folder, joined once and shared by every step."""
+
+    date: str
+    path: str
+    full_video: str
+    highlights: str
+
+    @classmethod
+    def for_date(cls, date: str) -> "DateFolder":
+        """Build the paths for a date folder under config.base_directory."""
+        path = os.path.join(config.base_directory, date)
+        return cls(
+            date=date,
+            path=path,
+            full_video=os.path.join(path, config.full_video_filename),
+            highlights=os.path.join(path, config.output_filename),
+        )
+
+
+def check_folder_status(folder: DateFolder) -> dict:
+    """
+    Check what exists in a date folder.
+
+    Uses a single directory scan rather than a stat per file, which matters on
+    Dropbox/network filesystems.
+    """
 
     status = {
-        "exists": os.path.isdir(date_folder),
+        "exists": False,
         "has_splits_csv": False,
         "has_full_video": False,
         "has_highlights": False,
+        "mp4_files": [],
         "mp4_count": 0,
     }
 
-    if not status["exists"]:
+    try:
+        entries = list(os.scandir(folder.path))
+    except (FileNotFoundError, NotADirectoryError):
         return status
+    status["exists"] = True
+
+    # Output and CSV names are matched exactly, like the paths main.py and
+    # upload_videos open. A differently-cased match still counts where the
+    # filesystem is case-insensitive, which os.path.exists settles.
+    exact_names = {
+        "splits.csv": "has_splits_csv",
+        config.full_video_filename: "has_full_video",
+        config.output_filename: "has_highlights",
+    }
+    names_lower = {name.lower(): name for name in exact_names}
+    case_mismatches = set()
+
+    for entry in entries:
+        name = entry.name
+        name_lower = name.lower()
+        if name in exact_names:
+            status[exact_names[name]] = True
+        elif name_lower in names_lower:
+            case_mismatches.add(names_lower[name_lower])
+        elif name_lower.endswith(".mp4"):
+            # Source MP4 files (output files are matched above)
+            status["mp4_files"].append(name)
+
+    for name in case_mismatches:
+        if not status[exact_names[name]]:
+            status[exact_names[name]] = os.path.exists(os.path.join(folder.path, name))
+
+    status["mp4_files"].sort()
+    status["mp4_count"] = len(status["mp4_files"])
 
-    status["has_splits_csv"] = os.path.exists(os.path.join(date_folder, "splits.csv"))
-    status["has_full_video"] = os.path.exists(
-        os.path.join(date_folder, config.full_video_filename)
-    )
-    status["has_highlights"] = os.path.exists(
-        os.path.join(date_folder, config.output_filename)
-    )
+    return status
 
-    # Count source MP4 files (exclude output files)
-    exclude_files = {config.output_filename.lower(), config.full_video_filename.lower()}
-    mp4_files = [
-        f
-        for f in os.listdir(date_folder)
-        if f.lower().endswith(".mp4") and f.lower() not in exclude_files
-    ]
-    status["mp4_count"] = len(mp4_files)
 
-    return status
+def _print_line(line: str) -> None:
+    """Print one line without interleaving with other workers."""
+    with _print_lock:
+        print(line, flush=True)
 
 
-def process_folder(date: str, force: bool = False) -> dict:
+def process_folder(
+    folder: DateFolder,
+    force: bool = False,
+    status: dict | None = None,
+    log_to_file: bool = False,
+) -> dict:
     """
     Process a single date folder.
 
+    Args:
+        folder: Paths for the date folder
+        force: Reprocess even if videos already exist
+        status: Result of check_folder_status(folder), if already computed
+        log_to_file: Send main.py's output to <date>/process.log and print
+            only a one-line summary, for parallel runs
+
     Returns dict with results for full_video and highlights.
     """
-    status = check_folder_status(date)
+    date = folder.date
+    if status is None:
+        status = check_folder_status(folder)
     result = {
         "date": date,
         "full_video": {"action": "skipped", "path": None},
@@ -135,20 +315,19 @@ def process_folder(date: str, force: bool = False) -> dict:
     }
 
     if not status["exists"]:
-        print(f"  Folder not found: {date}")
+        _print_line(f"  Folder not found: {date}")
         result["full_video"]["action"] = "error"
         result["highlights"]["action"] = "error"
         return result
 
     if status["mp4_count"] == 0:
-        print(f"  No source MP4 files found in {date}")
+        _print_line(f"  No source MP4 files found in {date}")
         result["full_video"]["action"] = "error"
         result["highlights"]["action"] = "error"
         return result
 
-    date_folder = os.path.join(config.base_directory, date)
-    full_video_path = os.path.join(date_folder, config.full_video_filename)
-    highlights_path = os.path.join(date_folder, config.output_filename)
+    full_video_path = folder.full_video
+    highlights_path = folder.highlights
 
     # Determine what needs to be done
     need_full_video = force or not status["has_full_video"]
@@ -157,16 +336,15 @@ def process_folder(date: str, force: bool = False) -> dict:
     ]
 
     if not need_full_video and not need_highlights:
-        print(f"  Both videos already exist, skipping")
+        _print_line(f"  {date}: both videos already exist, skipping")
         result["full_video"]["path"] = full_video_path
         result["highlights"]["path"] = highlights_path
         return result
 
     # Build command
+    # Run with this interpreter directly; `poetry run` would re-resolve the env
     cmd = [
-        "poetry",
-        "run",
-        "python",
+        sys.executable,
         "src/main.py",
         "--date",
         date,
@@ -174,6 +352,11 @@ def process_folder(date: str, force: bool = False) -> dict:
         config.base_directory,
     ]
 
+    # Hand over the MP4 list we already scanned so main.py doesn't list the
+    # folder again (it splits --videos on commas, so skip names containing one)
+    if not any("," in f for f in status["mp4_files"]):
+        cmd += ["--videos", ",".join(status["mp4_files"])]
+
     if need_full_video:
         cmd.append("--save-full-video")
     else:
@@ -182,48 +365,73 @@ def process_folder(date: str, force: bool = False) -> dict:
     if not need_highlights or not status["has_splits_csv"]:
         cmd.append("--skip-highlights")
         if not status["has_splits_csv"]:
-            print(f"  Warning: No splits.csv found, skipping highlights")
+            _print_line(f"  Warning: No splits.csv found in {date}, skipping highlights")
 
-    print(f"  Running: {' '.join(cmd)}")
+    # In parallel runs main.py's output goes to the folder's log instead
+    log = None
+    if log_to_file:
+        log_path = os.path.join(folder.path, PROCESS_LOG_FILENAME)
+        log = open(log_path, "w")
+    print(f"  Running: {' '.join(cmd)}", file=log, flush=True)
 
     try:
-        subprocess.run(cmd, check=True, cwd=Path(__file__).parent.parent)
+        subprocess.run(
+            cmd,
+            check=True,
+            cwd=Path(__file__).parent.parent,
+            stdout=log,
+            stderr=subprocess.STDOUT if log is not None else None,
+        )
 
+        # Keep status current so upload_videos can trust it without re-statting
         if need_full_video and os.path.exists(full_video_path):
             result["full_video"]["action"] = "created"
             result["full_video"]["path"] = full_video_path
+            status["has_full_video"] = True
         elif status["has_full_video"]:
             result["full_video"]["path"] = full_video_path
 
         if need_highlights and os.path.exists(highlights_path):
             result["highlights"]["action"] = "created"
             result["highlights"]["path"] = highlights_path
+            status["has_highlights"] = True
         elif status["has_highlights"]:
             result["highlights"]["path"] = highlights_path
 
     except subprocess.CalledProcessError as e:
-        print(f"  Error processing {date}: {e}")
+        print(f"  Error processing {date}: {e}", file=log)
         result["full_video"]["action"] = "error"
         result["highlights"]["action"] = "error"
 
+    finally:
+        if log is not None:
+            log.close()
+            outcome = "failed" if result["full_video"]["action"] == "error" else "done"
+            _print_line(f"  {date}: {outcome} (log: {log_path})")
+
     return result
 
 
 def upload_videos(
-    date: str, state: dict, privacy: str = "unlisted", uploads_this_run: int = 0,
+    folder: DateFolder, state: dict, status: dict, today: str,
+    privacy: str = "unlisted", uploads_this_run: int = 0,
     max_uploads: int = MAX_UPLOADS_PER_RUN
 ) -> tuple[dict, int]:
     """
     Upload videos for a date folder to YouTube.
 
+    status is the folder's check_folder_status() result (as updated by
+    process_folder), used instead of checking each video path again. today is
+    the run's date (YYYY-MM-DD) for the daily quota counter.
+
     Returns (results dict, updated uploads_this_run count)
     """
     from src.youtube import upload_video
 
-    date_folder = os.path.join(config.base_directory, date)
+    date = folder.date
     results = {"full_video": None, "highlights": None}
 
-    uploads_today = get_uploads_today(state)
+    uploads_today = get_uploads_today(state, today)
 
     # Check quota limits
     if uploads_this_run >= max_uploads:
@@ -236,8 +444,8 @@ def upload_videos(
         print(f"  YouTube allows ~6 uploads/day. Quota resets at midnight Pacific Time.")
 
     # Upload full video
-    full_video_path = os.path.join(date_folder, config.full_video_filename)
-    if os.path.exists(full_video_path):
+    full_video_path = folder.full_video
+    if status["has_full_video"]:
         if is_video_uploaded(state, date, "full_video"):
             print(f"  Full video already uploaded, skipping")
         elif uploads_this_run >= max_uploads:
@@ -253,7 +461,7 @@ def upload_videos(
                     privacy_status=privacy,
                 )
                 record_upload(state, date, "full_video", result["video_id"])
-                increment_upload_count(state)
+                increment_upload_count(state, today)
                 uploads_this_run += 1
                 results["full_video"] = result
                 print(f"  Full video uploaded: {result['url']}")
@@ -261,8 +469,8 @@ def upload_videos(
                 print(f"  Error uploading full video: {e}")
 
     # Upload highlights
-    highlights_path = os.path.join(date_folder, config.output_filename)
-    if os.path.exists(highlights_path):
+    highlights_path = folder.highlights
+    if status["has_highlights"]:
         if is_video_uploaded(state, date, "highlights"):
             print(f"  Highlights already uploaded, skipping")
         elif uploads_this_run >= max_uploads:
@@ -278,7 +486,7 @@ def upload_videos(
                     privacy_status=privacy,
                 )
                 record_upload(state, date, "highlights", result["video_id"])
-                increment_upload_count(state)
+                increment_upload_count(state, today)
                 uploads_this_run += 1
                 results["highlights"] = result
                 print(f"  Highlights uploaded: {result['url']}")
@@ -303,6 +511,9 @@ Examples:
   # Dry run (show what would be done)
   poetry run python src/batch_process.py --dates "2025-01-13,2025-01-20" --dry-run
 
+  # Process four folders at a time
+  poetry run python src/batch_process.py --dates "2025-01-13,2025-01-20" --jobs 4
+
   # Force reprocess
   poetry run python src/batch_process.py --dates "2025-01-13" --force
 
@@ -350,6 +561,12 @@ Examples:
         default=MAX_UPLOADS_PER_RUN,
         help=f"Max videos to upload this run (default: {MAX_UPLOADS_PER_RUN}, max safe: 6/day)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of date folders to process in parallel (default: {DEFAULT_JOBS})",
+    )
 
     args = parser.parse_args()
 
@@ -366,11 +583,15 @@ Examples:
     print(f"Base directory: {config.base_directory}")
     print()
 
+    # Scan each folder once up front and reuse the result below
+    folders = {date: DateFolder.for_date(date) for date in dates}
+    statuses = {date: check_folder_status(folders[date]) for date in dates}
+
     # Dry run - just show status
     if args.dry_run:
         print("=== DRY RUN ===\n")
         for date in dates:
-            status = check_folder_status(date)
+            status = statuses[date]
             print(f"{date}:")
             print(f"  Folder exists: {status['exists']}")
             if status["exists"]:
@@ -391,32 +612,52 @@ Examples:
     # Load upload state
     upload_state = load_upload_state()
     uploads_this_run = 0
+    today = datetime.now().strftime("%Y-%m-%d")
 
     # Show quota status
-    uploads_today = get_uploads_today(upload_state)
+    uploads_today = get_uploads_today(upload_state, today)
     if uploads_today > 0:
         print(f"Uploads today so far: {uploads_today}")
     print(f"Max uploads this run: {max_uploads}")
     print()
 
-    # Process folders
+    # Process folders. Folders are independent, so up to --jobs of them are
+    # processed at once, each logging to <date>/process.log; uploads stay
+    # sequential on this thread because they mutate upload_state.
     results = []
-    for i, date in enumerate(dates, 1):
-        print(f"\n[{i}/{len(dates)}] Processing {date}:")
-
+    jobs = max(1, min(args.jobs, len(dates)))
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
         if not args.upload_only:
-            result = process_folder(date, force=args.force)
-            results.append(result)
-
-        if args.upload or args.upload_only:
-            _, uploads_this_run = upload_videos(
-                date, upload_state, privacy=args.privacy, uploads_this_run=uploads_this_run,
-                max_uploads=max_uploads
-            )
-            if uploads_this_run >= max_uploads:
-                print(f"\n*** STOPPING: Reached upload limit ({max_uploads}) for this run ***")
-                print(f"*** Run again to continue with remaining dates ***")
-                break
+            print(f"Processing up to {jobs} folders in parallel")
+            futures = {
+                date: executor.submit(
+                    process_folder,
+                    folders[date],
+                    force=args.force,
+                    status=statuses[date],
+                    log_to_file=jobs > 1,
+                )
+                for date in dates
+            }
+
+        for i, date in enumerate(dates, 1):
+            _print_line(f"\n[{i}/{len(dates)}] Processing {date}:")
+
+            if not args.upload_only:
+                result = futures[date].result()
+                results.append(result)
+
+            if args.upload or args.upload_only:
+                _, uploads_this_run = upload_videos(
+                    folders[date], upload_state, statuses[date], today, privacy=args.privacy,
+                    uploads_this_run=uploads_this_run, max_uploads=max_uploads
+                )
+                if uploads_this_run >= max_uploads:
+                    print(f"\n*** STOPPING: Reached upload limit ({max_uploads}) for this run ***")
+                    print(f"*** Run again to continue with remaining dates ***")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
 
     # Summary
     print("\n" + "=" * 50)
@@ -440,6 +681,7 @@ Examples:
         print(f"Errors: {errors}")
 
     if args.upload or args.upload_only:
+        flush_upload_state()
         print(f"\nUpload state saved to: {STATE_FILE}")
 
 
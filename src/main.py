@@ -8,21 +8,24 @@ args:
 """
 
 import argparse
+import bisect
+import errno
+import functools
+import itertools
+import json
 import os
+import shutil
+import subprocess
 import sys
-import ipdb
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
-import pandas as pd
-from moviepy.editor import VideoFileClip, concatenate_videoclips
+import numpy as np
 from config import Config
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Get configuration
+# Get configuration (config.py loads the .env file)
 config = Config.from_env()
 before_goal_seconds = config.before_goal_seconds
 after_goal_seconds = config.after_goal_seconds
@@ -30,30 +33,358 @@ after_goal_seconds = config.after_goal_seconds
 # Determine default directory for files
 DEFAULT_DIR = os.getenv("FILE_DIR", os.path.dirname(os.path.abspath(__file__)))
 
-import pdb
 
+def parse_times_to_seconds(times):
+    """
+    Converts a Series of HH:MM:SS, MM:SS or SS time strings to an array of seconds.
+    """
+    if times.empty:
+        return np.array([])
+    times = times.astype(str).str.strip()
+    # Left-pad with "0:" until every value is HH:MM:SS so the columns line up
+    times = times.where(times.str.count(":") >= 2, "0:" + times)
+    times = times.where(times.str.count(":") >= 2, "0:" + times)
+    parts = times.str.split(":", expand=True).astype(float).to_numpy()
+    return parts @ np.array([3600.0, 60.0, 1.0])
+
+
+# Hardware H.264 encoders, in order of preference, for VIDEO_CODEC=auto
+HARDWARE_VIDEO_CODECS = ["h264_videotoolbox", "h264_nvenc", "h264_qsv"]
+
+# Encoder-specific tuning; the bitrate (VIDEO_BITRATE) is added separately
+VIDEO_ENCODER_PARAMS = {
+    "libx264": ["-preset", "faster", "-threads", "2"],  # Parallelism comes from workers
+    "h264_videotoolbox": ["-allow_sw", "1"],  # Fall back to software if the engine is busy
+    "h264_nvenc": ["-preset", "p4", "-tune", "hq", "-rc", "vbr"],
+    "h264_qsv": ["-preset", "faster"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def available_encoders():
+    """Return the set of encoder names supported by the local ffmpeg build."""
+    result = subprocess.run(
+        [config.ffmpeg_binary, "-hide_banner", "-encoders"],
+        capture_output=True,
+        text=True,
+    )
+    encoders = set()
+    for line in result.stdout.splitlines():
+        # Lines look like " V....D h264_videotoolbox    VideoToolbox H.264 Encoder"
+        fields = line.split()
+        if len(fields) >= 2 and len(fields[0]) == 6:
+            encoders.add(fields[1])
+    return encoders
+
+
+def resolve_video_codec(codec):
+    """Resolve "auto" to the first available hardware encoder, else libx264."""
+    if codec != "auto":
+        return codec
+    encoders = available_encoders()
+    for candidate in HARDWARE_VIDEO_CODECS:
+        if candidate in encoders:
+            return candidate
+    return "libx264"
+
+
+def video_encoder_args(codec):
+    """Return ffmpeg video encoder arguments for the given codec."""
+    params = VIDEO_ENCODER_PARAMS.get(codec, [])
+    if codec == "libx264":
+        return ["-c:v", codec, *params]
+    # Hardware encoders have no CRF mode, so rate-control by bitrate instead
+    return ["-c:v", codec, *params, "-b:v", config.video_bitrate, "-pix_fmt", "yuv420p"]
 
-def parse_time_to_seconds(t):
+
+def run_ffmpeg(args):
     """
-    Converts a time string in HH:MM:SS or MM:SS format to seconds.
+    Run ffmpeg with the given arguments, raising CalledProcessError on failure.
+
+    Warnings are kept: timestamp problems in a stream copy (e.g. "Non-monotonic
+    DTS") don't fail the run, and they are the only sign the output is damaged.
     """
-    parts = t.split(":")
-    if len(parts) == 3:  # HH:MM:SS format
-        hours, minutes, seconds = parts
-        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
-    elif len(parts) == 2:  # MM:SS format
-        minutes, seconds = parts
-        return int(minutes) * 60 + float(seconds)
-    else:
-        return float(parts[0])  # Handle case where the input is already in seconds
+    cmd = [config.ffmpeg_binary, "-hide_banner", "-loglevel", "warning", "-y", *args]
+    subprocess.run(cmd, check=True)
+
+
+def probe_duration(path):
+    """Return the container duration of a media file in seconds (headers only)."""
+    result = subprocess.run(
+        [
+            config.ffprobe_binary,
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "json",
+            path,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(json.loads(result.stdout)["format"]["duration"])
 
 
-def main(video_files, directory, date, save_full_video=None, skip_highlights=False):
+def probe_durations(video_paths):
+    """Probe the durations of several files concurrently, in input order."""
+    with ThreadPoolExecutor(max_workers=min(8, len(video_paths) or 1)) as executor:
+        return list(executor.map(probe_duration, video_paths))
+
+
+def probe_keyframes(path):
+    """
+    Return the sorted keyframe timestamps (seconds) of a file's video stream.
+
+    Reads packet headers only (no decoding): a packet flagged K starts a
+    keyframe.
+    """
+    result = subprocess.run(
+        [
+            config.ffprobe_binary,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "json",
+            path,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    keyframes = [
+        float(packet["pts_time"])
+        for packet in json.loads(result.stdout).get("packets", [])
+        if "K" in packet.get("flags", "") and packet.get("pts_time", "N/A") != "N/A"
+    ]
+    keyframes.sort()
+    return keyframes
+
+
+def concat_input_args(entries, list_path):
+    """
+    Write a concat demuxer list and return the ffmpeg input args for it.
+
+    entries are video paths, or (path, inpoint, outpoint) tuples to read only
+    part of a file. The list acts as one virtual input, so the sources can be
+    read end to end (and seeked across) without joining them on disk first.
+    """
+    with open(list_path, "w") as f:
+        for entry in entries:
+            path, inpoint, outpoint = (entry, None, None) if isinstance(entry, str) else entry
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+            if inpoint is not None:
+                f.write(f"inpoint {inpoint:.3f}\n")
+            if outpoint is not None:
+                f.write(f"outpoint {outpoint:.3f}\n")
+    return ["-f", "concat", "-safe", "0", "-i", list_path]
+
+
+def output_movflags_args():
+    """
+    Muxer flags for finished outputs (MP4_MOVFLAGS, default +faststart).
+
+    +faststart puts the index (moov atom) at the front for uploads and
+    streaming, at the cost of one rewrite of the file when muxing ends; a
+    fragmented layout such as frag_keyframe+empty_moov+default_base_moof
+    avoids that rewrite entirely.
+    """
+    return ["-movflags", config.mp4_movflags] if config.mp4_movflags else []
+
+
+def concat_videos(video_paths, output_path, work_dir, final_output=False):
+    """
+    Join videos end to end with the concat demuxer.
+
+    Streams are copied, not re-encoded, so all inputs must share the same
+    codecs and resolution (true for files from the same camera). Set
+    final_output for files that will be kept, so they get the configured
+    movflags.
+    """
+    list_path = os.path.join(work_dir, os.path.basename(output_path) + ".txt")
+    movflags = output_movflags_args() if final_output else []
+    run_ffmpeg([
+        "-fflags", "+genpts",
+        *concat_input_args(video_paths, list_path),
+        "-c", "copy",
+        *movflags,
+        output_path,
+    ])
+
+
+def move_into_place(staged_path, final_path):
+    """
+    Move a finished file from the staging directory to its final path.
+
+    os.replace is atomic on the same filesystem. Across filesystems the file is
+    copied next to the destination first and then swapped in, so the final
+    path never holds a half-written video (and any hard link to the previous
+    file keeps its old contents).
+    """
+    try:
+        os.replace(staged_path, final_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        partial_path = final_path + ".partial"
+        shutil.copyfile(staged_path, partial_path)
+        os.replace(partial_path, final_path)
+        os.remove(staged_path)
+
+
+def merge_segments(starts, ends):
+    """
+    Merge overlapping (start, end) windows into a sorted list of segments.
+
+    Goals a few seconds apart produce overlapping windows; merging them avoids
+    repeating the same footage in the reel and cutting more segments than needed.
+    """
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+
+    segments = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if segments and start <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], max(segments[-1][1], end))
+        else:
+            segments.append((start, end))
+    return segments
+
+
+def segment_concat_entries(video_paths, durations, segments):
+    """
+    Map segments on the joined timeline to per-file (path, inpoint, outpoint) entries.
+
+    The source file for each segment is found by binary search over the
+    cumulative file offsets. A segment that spans two source files becomes one
+    entry in each.
+    """
+    offsets = [0.0, *itertools.accumulate(durations)]
+    entries = []
+    for start, end in segments:
+        i = bisect.bisect_right(offsets, start) - 1
+        while i < len(video_paths) and offsets[i] < end:
+            file_start = offsets[i]
+            entries.append((
+                video_paths[i],
+                max(start, file_start) - file_start,
+                min(end, offsets[i + 1]) - file_start,
+            ))
+            i += 1
+    return entries
+
+
+def snap_to_keyframes(entries):
+    """
+    Move each entry's inpoint back to the keyframe at or before it.
+
+    A stream copy can only start cleanly on a keyframe: from any other
+    inpoint the concat demuxer still emits the packets back to the previous
+    keyframe, squeezed into a few milliseconds, which shows as a burst of
+    frames and an audio glitch at every cut. Snapping adds up to one GOP of
+    pre-roll instead. Entries in the same file that overlap once snapped are
+    merged, so no footage is repeated.
+    """
+    paths = list(dict.fromkeys(path for path, _, _ in entries))
+    with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as executor:
+        keyframes = dict(zip(paths, executor.map(probe_keyframes, paths)))
+
+    snapped = []
+    for path, inpoint, outpoint in entries:
+        file_keyframes = keyframes[path]
+        # Small tolerance so a cut that is already on a keyframe stays there
+        i = bisect.bisect_right(file_keyframes, inpoint + 1e-3) - 1
+        inpoint = file_keyframes[i] if i >= 0 else 0.0
+        if snapped and snapped[-1][0] == path and inpoint <= snapped[-1][2]:
+            snapped[-1] = (path, snapped[-1][1], max(snapped[-1][2], outpoint))
+        else:
+            snapped.append((path, inpoint, outpoint))
+    return snapped
+
+
+def encode_segment(path, inpoint, outpoint, segment_path, video_codec):
+    """Re-encode part of a source file with frame-accurate cut points."""
+    run_ffmpeg([
+        "-ss", f"{inpoint:.3f}",
+        "-i", path,
+        "-t", f"{outpoint - inpoint:.3f}",
+        *video_encoder_args(video_codec),
+        "-c:a", config.audio_codec,
+        "-avoid_negative_ts", "make_zero",
+        segment_path,
+    ])
+
+
+def encode_highlights(entries, output_path, work_dir, video_codec):
+    """
+    Re-encode each segment in parallel, then join them with a stream-copy concat.
+
+    Each worker seeks straight to its segment in the source file, so only the
+    highlight footage is decoded, and several small encoder instances scale
+    across cores better than more threads in a single one.
+    """
+    workers = max(1, config.encode_workers)
+    print(f"Encoding {len(entries)} segments with {video_codec} ({workers} workers)")
+    segment_paths = [
+        os.path.join(work_dir, f"segment_{i:04d}.mp4") for i in range(len(entries))
+    ]
+
+    # Threads are enough here: each worker just waits on its ffmpeg process
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(encode_segment, path, inpoint, outpoint, segment_path, video_codec)
+            for (path, inpoint, outpoint), segment_path in zip(entries, segment_paths)
+        ]
+        for i, future in enumerate(as_completed(futures), 1):
+            future.result()
+            print(f"  Encoded segment {i}/{len(entries)}")
+
+    concat_videos(segment_paths, output_path, work_dir, final_output=True)
+
+
+def extract_highlights(video_paths, durations, segments, output_path, work_dir):
+    """
+    Cut each (start, end) segment out of the joined sources into output_path.
+
+    By default this is one stream-copy ffmpeg run over a concat list with an
+    inpoint/outpoint entry per segment. Each inpoint is first moved back to
+    the preceding keyframe, so segments can start up to one GOP early. When
+    REENCODE_HIGHLIGHTS (or --reencode) is set, the segments are re-encoded
+    with frame-accurate cuts instead.
+    """
+    entries = segment_concat_entries(video_paths, durations, segments)
+
+    if config.reencode_highlights:
+        video_codec = resolve_video_codec(config.video_codec)
+        try:
+            encode_highlights(entries, output_path, work_dir, video_codec)
+        except subprocess.CalledProcessError:
+            # ffmpeg builds list NVENC even without a usable GPU
+            if config.video_codec != "auto" or video_codec == "libx264":
+                raise
+            print(f"{video_codec} failed, falling back to libx264")
+            encode_highlights(entries, output_path, work_dir, "libx264")
+        return
+
+    entries = snap_to_keyframes(entries)
+    run_ffmpeg([
+        "-fflags", "+genpts",
+        *concat_input_args(entries, os.path.join(work_dir, "segments.txt")),
+        "-c", "copy",
+        "-avoid_negative_ts", "make_zero",
+        *output_movflags_args(),
+        output_path,
+    ])
+
+
+def main(video_files, directory, date, save_full_video=None, skip_highlights=False, reencode=None):
     print(DEFAULT_DIR)
 
     # Override config if save_full_video is explicitly set
     if save_full_video is not None:
         config.save_full_video = save_full_video
+    if reencode is not None:
+        config.reencode_highlights = reencode
     # Build full paths to the CSV and video files
     base_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     date_folder = os.path.join(directory, date)
@@ -61,11 +392,12 @@ def main(video_files, directory, date, save_full_video=None, skip_highlights=Fal
     # If video_files is None, auto-discover all MP4 files in the date folder
     if video_files is None:
         # Exclude output files from auto-discovery
-        exclude_files = {config.output_filename.lower(), config.full_video_filename.lower()}
-        mp4_files = sorted(
-            [f for f in os.listdir(date_folder)
-             if f.lower().endswith(".mp4") and f.lower() not in exclude_files]
-        )
+        mp4_files = []
+        for f in os.listdir(date_folder):
+            name_lower = f.lower()
+            if name_lower.endswith(".mp4") and name_lower not in config.excluded_filenames_lower:
+                mp4_files.append(f)
+        mp4_files.sort()
         if not mp4_files:
             print(f"No MP4 files found in {date_folder}")
             sys.exit(1)
@@ -78,99 +410,87 @@ def main(video_files, directory, date, save_full_video=None, skip_highlights=Fal
 
     # Step 1: Read CSV (skip if only creating full video)
     if not skip_highlights:
+        # pandas is only needed here, so --help and full-video-only runs skip it
+        import pandas as pd
+
         csv_path = os.path.join(date_folder, "splits.csv")
-        df = pd.read_csv(csv_path)
-        cumulative_times = df["Cumulative Time"].apply(parse_time_to_seconds).tolist()
+        # Only the one column is needed, kept as strings for the vectorized parse
+        df = pd.read_csv(csv_path, usecols=["Cumulative Time"], dtype=str)
+        cumulative_times = parse_times_to_seconds(df["Cumulative Time"])
     else:
-        cumulative_times = []
-
-    # Step 2: Load and concatenate video files
-    clips = [VideoFileClip(v) for v in video_paths]
-    # import pdb
+        cumulative_times = np.array([])
 
-    # pdb.set_trace()
+    # Outputs are written to a local staging directory and moved into the
+    # (often Dropbox-synced) date folder when complete, so ffmpeg never stalls
+    # on a slow filesystem mid-write
+    with tempfile.TemporaryDirectory(
+        prefix="indoor-highlights-", dir=config.staging_directory
+    ) as work_dir:
+        # Step 2: Concatenate the video files (stream copy, no re-encode)
+        if config.save_full_video:
+            full_video_path = config.get_full_video_path(date)
+            staged_path = os.path.join(work_dir, config.full_video_filename)
+            print(f"Saving full uncut video to: {full_video_path}")
+            try:
+                concat_videos(video_paths, staged_path, work_dir, final_output=True)
+                move_into_place(staged_path, full_video_path)
+                print(f"Full uncut video saved to: {full_video_path}")
+            except subprocess.CalledProcessError as e:
+                print(f"Error saving full video: {e}")
+                print("Continuing with highlight creation...")
 
-    full_clip = concatenate_videoclips(clips)
+        # Step 3: Work out highlight segments from cumulative times (skip if --skip-highlights)
+        if not skip_highlights:
+            # Header-only probe of each source; no decoder is opened
+            durations = probe_durations(video_paths)
+            duration = sum(durations)
+            print(f"Full clip duration: {duration} seconds")
 
-    # Save the full uncut video if enabled
-    if config.save_full_video:
-        full_video_path = config.get_full_video_path(date)
-        print(f"Saving full uncut video to: {full_video_path}")
-        print(f"This may take several minutes for large videos...")
-        try:
-            full_clip.write_videofile(
-                full_video_path,
-                codec=config.video_codec,
-                audio_codec=config.audio_codec,
-                threads=4,  # Use multiple threads for faster encoding
-                preset='faster'  # Use faster encoding preset
-            )
-            print(f"Full uncut video saved to: {full_video_path}")
-        except Exception as e:
-            print(f"Error saving full video: {e}")
-            print("Continuing with highlight creation...")
-
-    # ipdb.set_trace()
-    # Step 3: Create and concatenate subclips based on cumulative times (skip if --skip-highlights)
-    if not skip_highlights:
-        final_clips = []
-        print(len(cumulative_times))
-        print(f"Full clip duration: {full_clip.duration} seconds")
-
-        for t in cumulative_times:
-            # Skip timestamps that exceed video duration
-            if t > full_clip.duration:
+            # Drop timestamps past the end of the footage (stale or from another
+            # session) with one mask, before any segment work is set up
+            in_range = cumulative_times <= duration
+            skipped = cumulative_times[~in_range]
+            if skipped.size:
                 print(
-                    f"Skipping timestamp {t} as it exceeds video duration ({full_clip.duration})"
+                    f"Skipping {skipped.size} of {cumulative_times.size} timestamps that "
+                    f"exceed video duration ({duration}): {', '.join(map(str, skipped))}"
                 )
-                continue
+            times = cumulative_times[in_range]
 
-            start = max(t - before_goal_seconds, 0)
-            end = min(t + after_goal_seconds, full_clip.duration)
-            print(f"Creating subclip from {start} to {end} based on t={t}")
-            subclip = full_clip.subclip(start, end)
-            final_clips.append(subclip)
+            starts = np.clip(times - before_goal_seconds, 0, duration)
+            ends = np.clip(times + after_goal_seconds, 0, duration)
+            for t, start, end in zip(times, starts, ends):
+                print(f"Creating subclip from {start} to {end} based on t={t}")
+            segments = merge_segments(starts, ends)
+            if len(segments) < len(times):
+                print(f"Merged {len(times)} overlapping clips into {len(segments)} segments")
 
-    # Step 4: Concatenate all the subclips into a final video
-    if not skip_highlights and final_clips:
-        final_video = concatenate_videoclips(final_clips)
-        output_path = config.get_output_path(date)
+        # Step 4: Cut the segments and join them into the final video
+        if not skip_highlights and segments:
+            output_path = config.get_output_path(date)
+            staged_path = os.path.join(work_dir, config.output_filename)
 
-        try:
-            final_video.write_videofile(
-                output_path,
-                codec=config.video_codec,
-                audio_codec=config.audio_codec,
-                threads=4,
-                preset='faster',
-                logger='bar'  # Force progress bar output
-            )
-
-            # Verify the file was actually created and has content
-            if os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                print(f"Highlights video saved to: {output_path}")
-                print(f"File size: {file_size / (1024*1024):.2f} MB")
-            else:
-                print(f"ERROR: File was not created at {output_path}")
-                sys.exit(1)
-        except Exception as e:
-            print(f"Error saving highlights video: {e}")
-            raise
-        finally:
-            # Clean up
-            final_video.close()
-    elif not skip_highlights:
-        print("No clips to produce from the given timestamps.")
+            try:
+                extract_highlights(video_paths, durations, segments, staged_path, work_dir)
+                move_into_place(staged_path, output_path)
+
+                # Verify the file was actually created and has content
+                if os.path.exists(output_path):
+                    file_size = os.path.getsize(output_path)
+                    print(f"Highlights video saved to: {output_path}")
+                    print(f"File size: {file_size / (1024*1024):.2f} MB")
+                else:
+                    print(f"ERROR: File was not created at {output_path}")
+                    sys.exit(1)
+            except subprocess.CalledProcessError as e:
+                print(f"Error saving highlights video: {e}")
+                raise
+        elif not skip_highlights:
+            print("No clips to produce from the given timestamps.")
 
     if skip_highlights:
         print("Skipped highlights creation (--skip-highlights flag was set)")
 
-    # Clean up video clips to free memory
-    full_clip.close()
-    for clip in clips:
-        clip.close()
-
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -213,5 +533,19 @@ if __name__ == "__main__":
         default=False,
         help="Skip highlights creation and only produce the full video"
     )
+    parser.add_argument(
+        "--reencode",
+        dest="reencode",
+        action="store_true",
+        default=None,
+        help="Re-encode highlight segments for frame-accurate cuts (slower than stream copy)"
+    )
     args = parser.parse_args()
-    main(args.videos, args.directory, args.date, args.save_full_video, args.skip_highlights)
+    main(
+        args.videos,
+        args.directory,
+        args.date,
+        args.save_full_video,
+        args.skip_highlights,
+        args.reencode,
+    )
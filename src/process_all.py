@@ -1,123 +1,279 @@
 """Process all folders: backup existing highlights and generate full videos."""
 
 import argparse
+import functools
 import os
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TextIO
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dotenv import load_dotenv
+# config.py loads the .env file
 from config import Config
 
-load_dotenv()
 config = Config.from_env()
 
+# Folders processed concurrently by default (each runs its own ffmpeg)
+DEFAULT_JOBS = 2
 
-def check_files_accessible(date_folder: str) -> tuple[bool, str]:
-    """Check if files in folder are accessible (not cloud-only placeholders)."""
+BACKUP_FILENAME = "final_video_original.mp4"
+
+# Per-folder log for parallel runs, written into the date folder
+PROCESS_LOG_FILENAME = "process.log"
+
+# Keeps summary lines from concurrent folders whole
+_print_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class FolderState:
+    """What a date folder contains, read in a single directory scan."""
+
+    date: str
+    path: str
+    exists: bool = False
+    mp4_files: tuple[str, ...] = ()
+    first_mp4_size: int = 0
+    has_final: bool = False
+    has_full: bool = False
+    has_splits: bool = False
+    has_backup: bool = False
+    final_size: int = 0
+
+
+def scan_folder(date_folder: str) -> FolderState:
+    """
+    Scan a date folder once with os.scandir.
+
+    Names and types come from the directory read itself, so the only stats
+    are for the two sizes we need; on Dropbox-synced folders each extra stat
+    is a round trip.
+    """
     folder_path = os.path.join(config.base_directory, date_folder)
+    try:
+        with os.scandir(folder_path) as it:
+            entries = list(it)
+    except (FileNotFoundError, NotADirectoryError):
+        return FolderState(date=date_folder, path=folder_path)
+
+    # Output, backup and CSV names are matched exactly, like the paths
+    # main.py and backup_final_video use. A differently-cased match still
+    # counts where the filesystem is case-insensitive, which a stat settles.
+    exact_names = {
+        config.output_filename, config.full_video_filename, "splits.csv", BACKUP_FILENAME,
+    }
+    names_lower = {name.lower(): name for name in exact_names}
+
+    mp4_entries = []
+    found = {}
+    case_mismatches = set()
+    for entry in entries:
+        name = entry.name
+        name_lower = name.lower()
+        if name in exact_names:
+            found[name] = entry
+        elif name_lower in names_lower:
+            case_mismatches.add(names_lower[name_lower])
+        if (
+            name_lower.endswith(".mp4")
+            and name_lower not in config.excluded_filenames_lower
+            and entry.is_file()
+        ):
+            mp4_entries.append(entry)
+
+    for name in case_mismatches - found.keys():
+        try:
+            found[name] = os.stat(os.path.join(folder_path, name))
+        except FileNotFoundError:
+            pass
+
+    final = found.get(config.output_filename)
+    has_full = config.full_video_filename in found
+    has_splits = "splits.csv" in found
+    has_backup = BACKUP_FILENAME in found
+    if isinstance(final, os.DirEntry):
+        final = final.stat()
+
+    return FolderState(
+        date=date_folder,
+        path=folder_path,
+        exists=True,
+        mp4_files=tuple(e.name for e in mp4_entries),
+        # Size of the first MP4 tells a cloud-only placeholder (0 bytes) apart
+        first_mp4_size=mp4_entries[0].stat().st_size if mp4_entries else 0,
+        has_final=final is not None,
+        has_full=has_full,
+        has_splits=has_splits,
+        has_backup=has_backup,
+        final_size=final.st_size if final is not None else 0,
+    )
 
-    if not os.path.isdir(folder_path):
-        return False, "Folder does not exist"
 
-    # Find MP4 files (exclude output files)
-    exclude = {config.output_filename.lower(), config.full_video_filename.lower()}
-    mp4_files = [
-        f for f in os.listdir(folder_path)
-        if f.lower().endswith(".mp4") and f.lower() not in exclude
-    ]
+def check_files_accessible(state: FolderState) -> tuple[bool, str]:
+    """Check if files in folder are accessible (not cloud-only placeholders)."""
+    if not state.exists:
+        return False, "Folder does not exist"
 
-    if not mp4_files:
+    if not state.mp4_files:
         return False, "No source MP4 files found"
 
-    # Check if first MP4 has content (not 0 bytes)
-    first_mp4 = os.path.join(folder_path, mp4_files[0])
-    size = os.path.getsize(first_mp4)
+    size = state.first_mp4_size
 
     if size == 0:
-        return False, f"Files are cloud-only (0 bytes). Make '{date_folder}' available offline in Dropbox first."
+        return False, f"Files are cloud-only (0 bytes). Make '{state.date}' available offline in Dropbox first."
 
-    return True, f"OK - {len(mp4_files)} MP4 files, first file is {size / (1024*1024):.1f} MB"
+    return True, f"OK - {len(state.mp4_files)} MP4 files, first file is {size / (1024*1024):.1f} MB"
 
 
-def backup_final_video(date_folder: str) -> bool:
-    """Backup existing final_video.mp4 to final_video_original.mp4."""
-    folder_path = os.path.join(config.base_directory, date_folder)
-    final_video = os.path.join(folder_path, config.output_filename)
-    backup_path = os.path.join(folder_path, "final_video_original.mp4")
+def clone_file(src: str, dst: str) -> None:
+    """
+    Duplicate src at dst as cheaply as the filesystem allows.
+
+    Tries a hardlink first, then a copy-on-write clone via cp (reflink on
+    Linux, clonefile on macOS), and only falls back to a full byte copy when
+    neither is supported. Sharing data with the original is safe because
+    main.py always replaces outputs by rename rather than writing in place.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
 
-    if not os.path.exists(final_video):
-        print(f"  No existing {config.output_filename} to backup")
+    clone_flag = "-c" if sys.platform == "darwin" else "--reflink=auto"
+    try:
+        subprocess.run(["cp", clone_flag, src, dst], check=True, capture_output=True)
+        return
+    except (OSError, subprocess.CalledProcessError):
+        if os.path.exists(dst):
+            os.remove(dst)
+
+    shutil.copy2(src, dst)
+
+
+def backup_final_video(state: FolderState, out: TextIO | None = None) -> bool:
+    """Backup existing final_video.mp4 to final_video_original.mp4, reporting to out."""
+    final_video = os.path.join(state.path, config.output_filename)
+    backup_path = os.path.join(state.path, BACKUP_FILENAME)
+
+    if not state.has_final:
+        print(f"  No existing {config.output_filename} to backup", file=out)
         return False
 
-    if os.path.exists(backup_path):
-        print(f"  Backup already exists: final_video_original.mp4")
+    if state.has_backup:
+        print(f"  Backup already exists: {BACKUP_FILENAME}", file=out)
         return True
 
     # Check if source has content
-    if os.path.getsize(final_video) == 0:
-        print(f"  {config.output_filename} is 0 bytes (cloud-only), skipping backup")
+    if state.final_size == 0:
+        print(f"  {config.output_filename} is 0 bytes (cloud-only), skipping backup", file=out)
         return False
 
-    print(f"  Backing up {config.output_filename} -> final_video_original.mp4")
-    shutil.copy2(final_video, backup_path)
+    print(f"  Backing up {config.output_filename} -> {BACKUP_FILENAME}", file=out)
+    clone_file(final_video, backup_path)
     return True
 
 
-def process_folder(date_folder: str, dry_run: bool = False) -> bool:
-    """Process a single folder: backup highlights, generate full video and new highlights."""
-    print(f"\nProcessing {date_folder}:")
+def process_folder(date_folder: str, dry_run: bool = False, log_to_file: bool = False) -> str:
+    """
+    Process a single folder: backup highlights, generate full video and new highlights.
+
+    Returns "ok", "failed", or "inaccessible" (cloud-only or missing files), so
+    callers don't need to re-check the folder to classify a failure.
 
-    # Check accessibility
-    accessible, msg = check_files_accessible(date_folder)
-    print(f"  Status: {msg}")
+    With log_to_file, for parallel runs, the folder's report and main.py's
+    output go to <date>/process.log and only a one-line summary is printed,
+    so concurrent folders don't interleave on the terminal.
+    """
+    state = scan_folder(date_folder)
+    accessible, msg = check_files_accessible(state)
+
+    if not log_to_file:
+        return _process_folder(state, accessible, msg, dry_run)
 
     if not accessible:
-        return False
+        _print_summary(f"{date_folder}: skipped - {msg}")
+        return "inaccessible"
+
+    log_path = os.path.join(state.path, PROCESS_LOG_FILENAME)
+    with open(log_path, "w") as log:
+        result = _process_folder(state, accessible, msg, dry_run, out=log)
+    _print_summary(f"{date_folder}: {result} (log: {log_path})")
+    return result
+
+
+def _print_summary(line: str) -> None:
+    """Print one line without interleaving with other workers."""
+    with _print_lock:
+        print(line, flush=True)
+
+
+def _process_folder(
+    state: FolderState,
+    accessible: bool,
+    msg: str,
+    dry_run: bool,
+    out: TextIO | None = None,
+) -> str:
+    """Report on and process a scanned folder, writing to out (default stdout)."""
+    date_folder = state.date
+    print(f"\nProcessing {date_folder}:", file=out)
+    print(f"  Status: {msg}", file=out)
+
+    if not accessible:
+        return "inaccessible"
 
     if dry_run:
-        folder_path = os.path.join(config.base_directory, date_folder)
-        has_final = os.path.exists(os.path.join(folder_path, config.output_filename))
-        has_full = os.path.exists(os.path.join(folder_path, config.full_video_filename))
-        has_splits = os.path.exists(os.path.join(folder_path, "splits.csv"))
-
-        print(f"  Has final_video.mp4: {has_final}")
-        print(f"  Has full_video.mp4: {has_full}")
-        print(f"  Has splits.csv: {has_splits}")
-        print(f"  Would backup final_video: {has_final}")
-        print(f"  Would create full_video: True")
-        print(f"  Would create new final_video: {has_splits}")
-        return True
+        print(f"  Has final_video.mp4: {state.has_final}", file=out)
+        print(f"  Has full_video.mp4: {state.has_full}", file=out)
+        print(f"  Has splits.csv: {state.has_splits}", file=out)
+        print(f"  Would backup final_video: {state.has_final}", file=out)
+        print(f"  Would create full_video: True", file=out)
+        print(f"  Would create new final_video: {state.has_splits}", file=out)
+        return "ok"
 
     # Backup existing final_video.mp4
-    backup_final_video(date_folder)
+    backup_final_video(state, out=out)
 
     # Run processing
+    # Run with this interpreter directly; `poetry run` would re-resolve the env
     cmd = [
-        "poetry", "run", "python", "src/main.py",
+        sys.executable, "src/main.py",
         "--date", date_folder,
         "--directory", config.base_directory,
         "--save-full-video",  # Always create full video
     ]
 
     # Check if splits.csv exists for highlights
-    folder_path = os.path.join(config.base_directory, date_folder)
-    if not os.path.exists(os.path.join(folder_path, "splits.csv")):
+    if not state.has_splits:
         cmd.append("--skip-highlights")
-        print(f"  No splits.csv, will only create full video")
+        print(f"  No splits.csv, will only create full video", file=out)
+
+    print(f"  Running: {' '.join(cmd)}", file=out)
 
-    print(f"  Running: {' '.join(cmd)}")
+    # The child writes to the same file, so our buffered lines go first
+    if out is not None:
+        out.flush()
 
     try:
-        subprocess.run(cmd, check=True, cwd=Path(__file__).parent.parent)
-        print(f"  Done!")
-        return True
+        subprocess.run(
+            cmd,
+            check=True,
+            cwd=Path(__file__).parent.parent,
+            stdout=out,
+            stderr=subprocess.STDOUT if out is not None else None,
+        )
+        print(f"  Done: {date_folder}", file=out)
+        return "ok"
     except subprocess.CalledProcessError as e:
-        print(f"  Error: {e}")
-        return False
+        print(f"  Error processing {date_folder}: {e}", file=out)
+        return "failed"
 
 
 def main():
@@ -137,6 +293,9 @@ Examples:
 
   # Process specific folders
   poetry run python src/process_all.py --dates "2025-01-13,2025-02-24"
+
+  # Process four folders at a time
+  poetry run python src/process_all.py --jobs 4
         """
     )
 
@@ -161,6 +320,12 @@ Examples:
         default="2025-11-10,2025-11-17",
         help="Comma-separated list of dates to exclude (default: 2025-11-10,2025-11-17)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of folders to process in parallel (default: {DEFAULT_JOBS})",
+    )
 
     args = parser.parse_args()
 
@@ -173,12 +338,13 @@ Examples:
     else:
         # Get all date folders
         exclude = set(d.strip() for d in args.exclude.split(",") if d.strip())
-        all_folders = sorted([
-            f for f in os.listdir(config.base_directory)
-            if os.path.isdir(os.path.join(config.base_directory, f))
-            and f.startswith("202")
-            and f not in exclude
-        ])
+        with os.scandir(config.base_directory) as entries:
+            all_folders = sorted(
+                e.name for e in entries
+                if e.is_dir()
+                and e.name.startswith("202")
+                and e.name not in exclude
+            )
         folders = all_folders
         print(f"Processing {len(folders)} folders (excluding: {', '.join(exclude)})")
 
@@ -190,17 +356,21 @@ Examples:
     failed = 0
     skipped = 0
 
-    for folder in folders:
-        result = process_folder(folder, dry_run=args.dry_run)
-        if result:
+    # Folders are independent, so process up to --jobs at once. A dry run only
+    # prints, so it stays sequential to keep each folder's report together.
+    # Parallel folders log to <date>/process.log rather than the terminal.
+    jobs = 1 if args.dry_run else max(1, min(args.jobs, len(folders)))
+    worker = functools.partial(process_folder, dry_run=args.dry_run, log_to_file=jobs > 1)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(worker, folders))
+
+    for result in results:
+        if result == "ok":
             success += 1
+        elif result == "inaccessible":
+            skipped += 1
         else:
-            # Check if it was just inaccessible
-            accessible, _ = check_files_accessible(folder)
-            if not accessible:
-                skipped += 1
-            else:
-                failed += 1
+            failed += 1
 
     # Summary
     print("\n" + "=" * 50)
@@ -1,6 +1,30 @@
 """YouTube upload module for indoor-highlights."""
 
-from .auth import get_authenticated_service
-from .uploader import YouTubeUploader, upload_video
+import importlib
 
-__all__ = ["get_authenticated_service", "YouTubeUploader", "upload_video"]
+__all__ = [
+    "get_authenticated_service",
+    "YouTubeUploader",
+    "upload_video",
+    "upload_video_async",
+    "upload_many",
+]
+
+# Exports are resolved on first access so importing the package (e.g. for
+# `python -m src.youtube.cli --help`) doesn't pull in the Google client libraries
+_EXPORTS = {
+    "get_authenticated_service": ".auth",
+    "YouTubeUploader": ".uploader",
+    "upload_video": ".uploader",
+    "upload_video_async": ".uploader",
+    "upload_many": ".uploader",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,9 @@
 """OAuth2 authentication for YouTube Data API."""
 
+import functools
 import os
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from google.auth.transport.requests import Request
@@ -11,16 +14,31 @@ from googleapiclient.discovery import build
 # YouTube upload scope
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
 
+# Refresh tokens this close to expiry rather than letting a request find out
+TOKEN_REFRESH_MARGIN = timedelta(seconds=120)
+
 # Default paths (relative to project root)
 DEFAULT_CLIENT_SECRETS = "credentials/client_secrets.json"
 DEFAULT_TOKEN_FILE = "credentials/token.json"
 
 
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """Get the project root directory."""
     return Path(__file__).parent.parent.parent
 
 
+# Default paths resolved once, at import
+DEFAULT_CLIENT_SECRETS_PATH = get_project_root() / DEFAULT_CLIENT_SECRETS
+DEFAULT_TOKEN_PATH = get_project_root() / DEFAULT_TOKEN_FILE
+
+# Credentials loaded this process, by (secrets file, token file). Services
+# aren't cached, since their httplib2 connections can't be shared between
+# threads, but they can all share credentials.
+_credentials_cache: dict[tuple[Path, Path], Credentials] = {}
+_credentials_lock = threading.Lock()
+
+
 def get_authenticated_service(
     client_secrets_path: str | None = None,
     token_path: str | None = None,
@@ -29,8 +47,8 @@ def get_authenticated_service(
     Get an authenticated YouTube service.
 
     Handles:
-    1. Loading existing token from token.json
-    2. Refreshing expired tokens automatically
+    1. Loading existing token from token.json (once per process)
+    2. Refreshing expired or nearly expired tokens automatically
     3. Running OAuth flow for first-time setup
     4. Saving new tokens for future use
 
@@ -41,45 +59,55 @@ def get_authenticated_service(
     Returns:
         Authenticated YouTube service resource
     """
-    project_root = get_project_root()
-
     # Resolve paths
-    if client_secrets_path:
-        secrets_file = Path(client_secrets_path)
-    else:
-        secrets_file = project_root / DEFAULT_CLIENT_SECRETS
-
-    if token_path:
-        token_file = Path(token_path)
-    else:
-        token_file = project_root / DEFAULT_TOKEN_FILE
+    secrets_file = Path(client_secrets_path) if client_secrets_path else DEFAULT_CLIENT_SECRETS_PATH
+    token_file = Path(token_path) if token_path else DEFAULT_TOKEN_PATH
 
-    credentials = _load_or_refresh_credentials(secrets_file, token_file)
+    with _credentials_lock:
+        credentials = _credentials_cache.get((secrets_file, token_file))
+        if credentials is None or not _is_fresh(credentials):
+            credentials = _load_or_refresh_credentials(secrets_file, token_file, credentials)
+            _credentials_cache[(secrets_file, token_file)] = credentials
 
     return build("youtube", "v3", credentials=credentials)
 
 
+def _is_fresh(credentials: Credentials) -> bool:
+    """Whether credentials are valid for at least TOKEN_REFRESH_MARGIN more."""
+    if not credentials.valid:
+        return False
+    if credentials.expiry is None:
+        return True
+    # google-auth keeps expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now > TOKEN_REFRESH_MARGIN
+
+
 def _load_or_refresh_credentials(
     secrets_file: Path,
     token_file: Path,
+    credentials: Credentials | None = None,
 ) -> Credentials:
-    """Load existing credentials or run OAuth flow."""
-    credentials = None
-
+    """Load existing credentials (unless already loaded) or run OAuth flow."""
     # Try to load existing token
-    if token_file.exists():
+    if credentials is None and token_file.exists():
         credentials = Credentials.from_authorized_user_file(str(token_file), SCOPES)
 
     # Check if credentials are valid or need refresh
-    if credentials and credentials.valid:
+    if credentials and _is_fresh(credentials):
         return credentials
 
-    if credentials and credentials.expired and credentials.refresh_token:
+    if credentials and credentials.refresh_token:
         print("Refreshing expired credentials...")
         credentials.refresh(Request())
         _save_credentials(credentials, token_file)
         return credentials
 
+    # Without a refresh token there's no refreshing early, so use the token
+    # until it actually expires rather than sending the user to the browser
+    if credentials and credentials.valid:
+        return credentials
+
     # Need to run OAuth flow
     if not secrets_file.exists():
         raise FileNotFoundError(
@@ -3,9 +3,6 @@
 import argparse
 import sys
 
-from .auth import authenticate_only
-from .uploader import upload_video, YouTubeUploadError
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -76,11 +73,26 @@ Examples:
         default="unlisted",
         help="Privacy status (default: unlisted)",
     )
+    parser.add_argument(
+        "--thumbnail",
+        type=str,
+        help="Image to set as the video's custom thumbnail",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Upload chunk size in MB (default: 8). Larger chunks mean fewer requests on fast links",
+    )
 
     args = parser.parse_args()
 
     # Handle auth-only mode
+    # The Google client libraries are slow to import, so load them only once
+    # argument parsing has succeeded (--help and usage errors stay fast)
     if args.auth_only:
+        from .auth import authenticate_only
+
         print("Running authentication setup...")
         success = authenticate_only()
         sys.exit(0 if success else 1)
@@ -90,10 +102,16 @@ Examples:
         parser.error("--file is required for upload (or use --auth-only)")
     if not args.title:
         parser.error("--title is required for upload")
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        parser.error("--chunk-size must be a positive number of MB")
 
     # Parse tags
     tags = [tag.strip() for tag in args.tags.split(",") if tag.strip()]
 
+    from .uploader import upload_video, YouTubeUploadError
+
+    chunksize = args.chunk_size * 1024 * 1024 if args.chunk_size is not None else None
+
     # Upload
     try:
         result = upload_video(
@@ -103,6 +121,8 @@ Examples:
             tags=tags,
             category_id=args.category,
             privacy_status=args.privacy,
+            chunksize=chunksize,
+            thumbnail_path=args.thumbnail,
         )
         print(f"\nSuccess! Video ID: {result['video_id']}")
         print(f"URL: {result['url']}")
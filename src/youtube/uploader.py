@@ -1,22 +1,95 @@
 """YouTube video uploader with resumable upload support."""
 
+import asyncio
+import contextlib
+import json
+import os
 import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import BinaryIO, Callable
 
 import httplib2
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 
 from .auth import get_authenticated_service
 
 # Retry configuration
-MAX_RETRIES = 10
-RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
+# Separate budgets, so a flaky network can't use up the retries kept for
+# server errors (or the reverse)
+MAX_HTTP_RETRIES = 5  # Retriable HTTP errors (5xx, rate limits)
+MAX_NETWORK_RETRIES = 10  # Connection and I/O errors
+SESSION_EXPIRED_STATUS_CODES = frozenset({404, 410})  # Resumable session URI is gone
+MAX_SESSION_RESTARTS = 1
+BASE_BACKOFF = 1.0  # Seconds before the first retry
+MAX_BACKOFF = 64.0  # Cap on the exponential part of the delay
+RETRIABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
 RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, IOError)
+# 403 reasons for short-term rate limits, unlike the daily "quotaExceeded"
+RETRIABLE_403_REASONS = frozenset({"userRateLimitExceeded", "rateLimitExceeded", "backendError"})
+
+# Resumable upload chunk size (must be a multiple of 256KB)
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB: ~8x fewer requests than 1MB chunks
+MIN_CHUNK_SIZE = 1024 * 1024  # Floor when shrinking after retries
+MAX_CHUNK_SIZE = 64 * 1024 * 1024  # Ceiling when growing after clean uploads
+
+# Files smaller than this skip the resumable session setup round trip
+SIMPLE_UPLOAD_MAX_BYTES = 5 * 1024 * 1024
+
+# Read-ahead for the source file, so each chunk is one large sequential read
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Without a progress callback, print progress at most this often
+PROGRESS_PRINT_PERCENT = 5
+PROGRESS_PRINT_SECONDS = 5.0
+
+# Uploads run at once by upload_many; more risks per-user rate limiting
+MAX_CONCURRENT_UPLOADS = 4
 
 # YouTube category IDs
 CATEGORY_SPORTS = "17"
+# Categories videos can be uploaded to (the rest are listing-only)
+ASSIGNABLE_CATEGORIES = frozenset({
+    "1", "2", "10", "15", "17", "19", "20", "22",
+    "23", "24", "25", "26", "27", "28", "29",
+})
+
+# Metadata limits enforced by YouTube (checked before any bytes are sent)
+MAX_TITLE_LENGTH = 100
+MAX_DESCRIPTION_BYTES = 5000
+MAX_TAGS_LENGTH = 500
+PRIVACY_STATUSES = frozenset({"public", "private", "unlisted"})
+
+# Resource parts sent with every insert
+_PART = "snippet,status"
+
+
+# Authenticated services, one per thread: reusing a service keeps its
+# httplib2 connection (and TLS session) alive across uploads, and httplib2
+# objects aren't safe to share between threads
+_thread_local = threading.local()
+
+
+def get_shared_service():
+    """Get this thread's authenticated YouTube service, creating it on first use."""
+    service = getattr(_thread_local, "service", None)
+    if service is None:
+        service = get_authenticated_service()
+        _thread_local.service = service
+    return service
+
+
+def get_shared_uploader() -> "YouTubeUploader":
+    """Get this thread's default uploader, so its chunk size adapts across uploads."""
+    uploader = getattr(_thread_local, "uploader", None)
+    if uploader is None:
+        uploader = YouTubeUploader()
+        _thread_local.uploader = uploader
+    return uploader
 
 
 class YouTubeUploadError(Exception):
@@ -37,24 +110,126 @@ class UploadFailedError(YouTubeUploadError):
     pass
 
 
+class InvalidMetadataError(YouTubeUploadError):
+    """Video metadata would be rejected by YouTube."""
+
+    pass
+
+
+def validate_metadata(
+    title: str,
+    description: str = "",
+    tags: list[str] | None = None,
+    category_id: str = CATEGORY_SPORTS,
+    privacy_status: str = "unlisted",
+) -> None:
+    """
+    Check video metadata against YouTube's limits before uploading.
+
+    YouTube only rejects bad metadata once the whole file has been sent, so
+    catching it here saves the upload.
+
+    Raises:
+        InvalidMetadataError: If any field would be rejected
+    """
+    if not title or not title.strip():
+        raise InvalidMetadataError("Title is required")
+    if len(title) > MAX_TITLE_LENGTH:
+        raise InvalidMetadataError(
+            f"Title is {len(title)} characters (max {MAX_TITLE_LENGTH})"
+        )
+    if "<" in title or ">" in title or "<" in description or ">" in description:
+        raise InvalidMetadataError("Title and description can't contain '<' or '>'")
+    description_bytes = len(description.encode("utf-8"))
+    if description_bytes > MAX_DESCRIPTION_BYTES:
+        raise InvalidMetadataError(
+            f"Description is {description_bytes} bytes (max {MAX_DESCRIPTION_BYTES})"
+        )
+
+    # YouTube counts tags containing spaces as quoted, plus a comma between tags
+    tags = tags or []
+    tags_length = sum(len(tag) + (2 if " " in tag else 0) for tag in tags)
+    tags_length += max(0, len(tags) - 1)
+    if tags_length > MAX_TAGS_LENGTH:
+        raise InvalidMetadataError(
+            f"Tags total {tags_length} characters (max {MAX_TAGS_LENGTH})"
+        )
+
+    if privacy_status not in PRIVACY_STATUSES:
+        raise InvalidMetadataError(f"Invalid privacy status: {privacy_status!r}")
+    if category_id not in ASSIGNABLE_CATEGORIES:
+        raise InvalidMetadataError(f"Category {category_id!r} can't be assigned to uploads")
+
+
+def _fadvise(fd, advice: str) -> None:
+    """Give the kernel an access-pattern hint for a whole open file, where supported."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd.fileno(), 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+
+def _error_reason(e: HttpError) -> str:
+    """Get the first error reason from an API error response, or "" if there is none."""
+    try:
+        return json.loads(e.content)["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ""
+
+
+def _retry_after(e: Exception) -> float | None:
+    """
+    Get the delay a Retry-After header asks for, in seconds, if there is one.
+
+    The header is either a number of seconds or an HTTP date.
+    """
+    if not isinstance(e, HttpError):
+        return None
+    value = e.resp.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class YouTubeUploader:
     """Handles video uploads to YouTube with resumable upload support."""
 
-    def __init__(self, youtube_service=None):
+    def __init__(self, youtube_service=None, chunksize: int = DEFAULT_CHUNK_SIZE):
         """
         Initialize uploader.
 
         Args:
-            youtube_service: Authenticated YouTube service (optional, will create if not provided)
+            youtube_service: Authenticated YouTube service (optional, shared per thread if not provided)
+            chunksize: Starting resumable chunk size, adapted after each upload
         """
         self.youtube = youtube_service
+        self.chunksize = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, chunksize))
+        self.last_retries = 0
+        self._insert = None
 
     def _get_service(self):
-        """Get or create YouTube service."""
+        """Get the YouTube service, reusing this thread's shared one by default."""
         if self.youtube is None:
-            self.youtube = get_authenticated_service()
+            self.youtube = get_shared_service()
         return self.youtube
 
+    def _get_insert(self):
+        """Get the service's videos().insert method, looked up once per uploader."""
+        if self._insert is None:
+            self._insert = self._get_service().videos().insert
+        return self._insert
+
     def upload(
         self,
         video_path: str,
@@ -64,6 +239,9 @@ class YouTubeUploader:
         category_id: str = CATEGORY_SPORTS,
         privacy_status: str = "unlisted",
         made_for_kids: bool = False,
+        chunksize: int | None = None,
+        progress_callback: Callable[[float], None] | None = None,
+        thumbnail_path: str | None = None,
     ) -> dict:
         """
         Upload video to YouTube.
@@ -76,18 +254,183 @@ class YouTubeUploader:
             category_id: YouTube category ID (17 = Sports)
             privacy_status: public, private, or unlisted
             made_for_kids: Whether video is made for kids
+            chunksize: Bytes per resumable request (optional, replaces the
+                adapted size if given; clamped to 1-64MB)
+            progress_callback: Called with the fraction uploaded (0-1) after
+                each chunk, instead of printing progress
+            thumbnail_path: Image to set as the custom thumbnail (optional)
 
         Returns:
             dict with video_id and url on success
 
         Raises:
-            YouTubeUploadError: On upload failure
+            YouTubeUploadError: On upload failure (InvalidMetadataError before
+                anything is sent if the metadata would be rejected)
+        """
+        validate_metadata(title, description, tags, category_id, privacy_status)
+
+        with self._open_upload(
+            video_path, title, description, tags, category_id,
+            privacy_status, made_for_kids, chunksize,
+        ) as new_request:
+            response = self._resumable_upload(
+                new_request(), new_request, progress_callback
+            )
+
+        result = self._upload_result(response, title)
+        if thumbnail_path:
+            self._set_thumbnail(result["video_id"], thumbnail_path)
+        return result
+
+    async def upload_async(
+        self,
+        video_path: str,
+        title: str,
+        description: str = "",
+        tags: list[str] | None = None,
+        category_id: str = CATEGORY_SPORTS,
+        privacy_status: str = "unlisted",
+        made_for_kids: bool = False,
+        chunksize: int | None = None,
+        progress_callback: Callable[[float], None] | None = None,
+        thumbnail_path: str | None = None,
+    ) -> dict:
+        """
+        Upload video to YouTube without blocking the event loop.
+
+        Takes the same arguments as upload. Each chunk is sent from a worker
+        thread and retry backoff uses asyncio.sleep, so concurrent uploads
+        don't each tie up a thread while they wait. Don't run several of
+        these on one uploader at once: they would share its HTTP connection.
+        """
+        validate_metadata(title, description, tags, category_id, privacy_status)
+
+        # Loading credentials may read the token file or refresh it
+        await asyncio.to_thread(self._get_service)
+
+        with self._open_upload(
+            video_path, title, description, tags, category_id,
+            privacy_status, made_for_kids, chunksize,
+        ) as new_request:
+            response = await self._resumable_upload_async(
+                new_request(), new_request, progress_callback
+            )
+
+        result = self._upload_result(response, title)
+        if thumbnail_path:
+            await asyncio.to_thread(self._set_thumbnail, result["video_id"], thumbnail_path)
+        return result
+
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        title: str,
+        description: str = "",
+        tags: list[str] | None = None,
+        category_id: str = CATEGORY_SPORTS,
+        privacy_status: str = "unlisted",
+        made_for_kids: bool = False,
+        chunksize: int | None = None,
+        progress_callback: Callable[[float], None] | None = None,
+        thumbnail_path: str | None = None,
+        name: str = "stream",
+    ) -> dict:
+        """
+        Upload video data from an in-memory or other seekable binary stream.
+
+        Takes the same arguments as upload, with the stream (e.g. an
+        io.BytesIO holding an encoded clip) in place of a path, so data that
+        is already in memory never has to go through a file. name is only
+        used in progress output. The stream must be seekable: the client
+        library measures it and rewinds to resend chunks after a failure, so
+        pipes can't be used.
+        """
+        validate_metadata(title, description, tags, category_id, privacy_status)
+
+        size = stream.seek(0, os.SEEK_END)
+        stream.seek(0)
+
+        with self._prepare_upload(
+            stream, size, name, title, description, tags, category_id,
+            privacy_status, made_for_kids, chunksize,
+        ) as new_request:
+            response = self._resumable_upload(
+                new_request(), new_request, progress_callback
+            )
+
+        result = self._upload_result(response, title)
+        if thumbnail_path:
+            self._set_thumbnail(result["video_id"], thumbnail_path)
+        return result
+
+    @contextlib.contextmanager
+    def _open_upload(
+        self,
+        video_path: str,
+        title: str,
+        description: str,
+        tags: list[str] | None,
+        category_id: str,
+        privacy_status: str,
+        made_for_kids: bool,
+        chunksize: int | None,
+    ):
+        """
+        Open the video and yield a factory for its insert request.
+
+        Calling the factory again starts a new upload session over the same
+        open file. The chunk size is adapted after a successful upload.
         """
         video_file = Path(video_path)
-        if not video_file.exists():
+        # Size the file through the descriptor we upload from: one path
+        # lookup, and no window for it to change between stat and open.
+        # The large read buffer makes each chunk a few big sequential reads.
+        try:
+            fd = open(video_file, "rb", buffering=READ_BUFFER_SIZE)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
-        youtube = self._get_service()
+        with fd:
+            size = os.fstat(fd.fileno()).st_size
+            _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+            try:
+                with self._prepare_upload(
+                    fd, size, video_file.name, title, description, tags,
+                    category_id, privacy_status, made_for_kids, chunksize,
+                ) as new_request:
+                    yield new_request
+            finally:
+                # The sent file won't be read again; don't let it crowd out
+                # the page cache
+                _fadvise(fd, "POSIX_FADV_DONTNEED")
+
+    @contextlib.contextmanager
+    def _prepare_upload(
+        self,
+        fd: BinaryIO,
+        size: int,
+        name: str,
+        title: str,
+        description: str,
+        tags: list[str] | None,
+        category_id: str,
+        privacy_status: str,
+        made_for_kids: bool,
+        chunksize: int | None,
+    ):
+        """
+        Yield a factory for the insert request uploading fd.
+
+        Large videos use a resumable upload; small ones go up in one plain
+        request. The chunk size is adapted after a successful upload.
+        """
+        resumable = size >= SIMPLE_UPLOAD_MAX_BYTES
+
+        insert = self._get_insert()
+        if chunksize is not None:
+            # Same bounds as adaptation, so a bad value can't stall an upload
+            self.chunksize = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, chunksize))
+        chunksize = self.chunksize
 
         body = {
             "snippet": {
@@ -102,23 +445,31 @@ class YouTubeUploader:
             },
         }
 
-        # Use resumable upload for large files
-        media = MediaFileUpload(
-            str(video_file),
-            chunksize=1024 * 1024,  # 1MB chunks
-            resumable=True,
-            mimetype="video/*",
-        )
-
-        request = youtube.videos().insert(
-            part="snippet,status",
-            body=body,
-            media_body=media,
-        )
-
-        print(f"Uploading: {video_file.name}")
-        response = self._resumable_upload(request)
-
+        def new_request():
+            media = MediaIoBaseUpload(
+                fd,
+                mimetype="video/*",
+                chunksize=chunksize,
+                resumable=resumable,
+            )
+            return insert(
+                part=_PART,
+                body=body,
+                media_body=media,
+            )
+
+        print(f"Uploading: {name}")
+        self.last_retries = 0
+        yield new_request
+
+        # Only reached when the upload succeeded: a failed one (quota, a
+        # rejected request) says nothing about how well the link coped
+        if resumable:
+            self._adapt_chunksize()
+
+    @staticmethod
+    def _upload_result(response: dict, title: str) -> dict:
+        """Build the result dict for a finished upload."""
         video_id = response["id"]
         video_url = f"https://www.youtube.com/watch?v={video_id}"
 
@@ -130,44 +481,199 @@ class YouTubeUploader:
             "title": title,
         }
 
-    def _resumable_upload(self, request) -> dict:
+    def _set_thumbnail(self, video_id: str, thumbnail_path: str) -> None:
+        """
+        Set a custom thumbnail on an uploaded video.
+
+        Sent straight after the upload on the same service, so it reuses the
+        open connection (media uploads can't go in a batch request). Failure
+        is reported but not raised: the video itself is already uploaded.
+        """
+        try:
+            self._get_service().thumbnails().set(
+                videoId=video_id,
+                media_body=MediaFileUpload(thumbnail_path),
+            ).execute()
+            print(f"Thumbnail set from {thumbnail_path}")
+        except (HttpError, OSError, *RETRIABLE_EXCEPTIONS) as e:
+            print(f"  Warning: could not set thumbnail: {e}")
+
+    def _adapt_chunksize(self) -> None:
+        """
+        Tune the chunk size for the next upload from how this one went.
+
+        Retries halve it (less to resend on a flaky link); a clean upload
+        doubles it (fewer round trips on a good one), within
+        MIN_CHUNK_SIZE..MAX_CHUNK_SIZE. The library fixes the size for the
+        length of a single upload, so this only applies between uploads.
+        """
+        if self.last_retries:
+            self.chunksize = max(MIN_CHUNK_SIZE, self.chunksize // 2)
+        else:
+            self.chunksize = min(MAX_CHUNK_SIZE, self.chunksize * 2)
+
+    @staticmethod
+    def _send(request):
+        """Send the next chunk, or the whole body of a non-resumable (small file) upload."""
+        if request.resumable is None:
+            return None, request.execute()
+        return request.next_chunk()
+
+    @staticmethod
+    def _progress_reporter(progress_callback=None):
+        """
+        Build the function called with the status of each accepted chunk.
+
+        It passes the fraction uploaded to progress_callback if one is given.
+        Otherwise it prints, but only every PROGRESS_PRINT_PERCENT or
+        PROGRESS_PRINT_SECONDS, so small chunks don't flood the terminal.
+        """
+        if progress_callback is not None:
+            def report(status):
+                if status:
+                    progress_callback(status.progress())
+            return report
+
+        last_percent = 0
+        last_time = time.monotonic()
+
+        def report(status):
+            nonlocal last_percent, last_time
+            if not status:
+                return
+            progress = int(status.progress() * 100)
+            now = time.monotonic()
+            if (
+                progress - last_percent >= PROGRESS_PRINT_PERCENT
+                or now - last_time >= PROGRESS_PRINT_SECONDS
+            ):
+                print(f"  Uploaded {progress}%")
+                last_percent, last_time = progress, now
+
+        return report
+
+    @staticmethod
+    def _session_expired(e: Exception) -> bool:
+        """Whether an error means the resumable session URI is gone."""
+        return isinstance(e, HttpError) and e.resp.status in SESSION_EXPIRED_STATUS_CODES
+
+    @staticmethod
+    def _retriable_error(e: Exception) -> str:
+        """Describe a retriable error, or raise if the upload can't continue."""
+        if not isinstance(e, HttpError):
+            return f"Retriable error: {e}"
+
+        reason = _error_reason(e) if e.resp.status == 403 else ""
+        if reason == "quotaExceeded":
+            raise QuotaExceededError(
+                "YouTube API quota exceeded. "
+                "Quota resets at midnight Pacific Time."
+            )
+        if e.resp.status in RETRIABLE_STATUS_CODES or reason in RETRIABLE_403_REASONS:
+            return f"Retriable HTTP error {e.resp.status}: {e.content}"
+        raise UploadFailedError(f"HTTP error {e.resp.status}: {e.content}")
+
+    def _backoff(
+        self,
+        retries: dict[str, int],
+        e: Exception,
+        error: str,
+    ) -> float:
+        """
+        Count a retry against its error class and return how long to wait.
+
+        HTTP errors and network errors have separate budgets
+        (MAX_HTTP_RETRIES, MAX_NETWORK_RETRIES); the delay grows with
+        whichever count is higher, so total waiting stays bounded. A
+        server-provided Retry-After delay is honoured when it is longer than
+        the computed backoff.
+        """
+        self.last_retries += 1
+        if isinstance(e, HttpError):
+            kind, limit = "http", MAX_HTTP_RETRIES
+        else:
+            kind, limit = "network", MAX_NETWORK_RETRIES
+        retries[kind] += 1
+        if retries[kind] > limit:
+            raise UploadFailedError(f"Max retries exceeded: {error}")
+
+        # Capped exponential backoff plus up to as much again in jitter
+        retry = max(retries.values())
+        sleep_seconds = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (retry - 1))
+        sleep_seconds += random.uniform(0, sleep_seconds)
+        retry_after = _retry_after(e)
+        if retry_after is not None:
+            sleep_seconds = max(sleep_seconds, retry_after)
+        print(f"  Retry {retries[kind]}/{limit} ({kind}) in {sleep_seconds:.1f}s...")
+        return sleep_seconds
+
+    def _resumable_upload(self, request, new_request=None, progress_callback=None) -> dict:
         """
         Execute upload with exponential backoff retry logic.
 
-        Handles network interruptions and server errors.
+        Handles network interruptions and server errors, for both resumable
+        and single-request uploads. Delays double from BASE_BACKOFF up to
+        MAX_BACKOFF, and the retry counts reset whenever a chunk is accepted,
+        so the retry limits apply to consecutive failures.
+
+        If the resumable session expires (404/410) and new_request is given,
+        it is called to open a fresh session, at most MAX_SESSION_RESTARTS times.
+        Progress goes to progress_callback, or is printed (throttled).
         """
+        report_progress = self._progress_reporter(progress_callback)
         response = None
-        error = None
-        retry = 0
+        retries = {"http": 0, "network": 0}
+        restarts = 0
 
         while response is None:
             try:
-                status, response = request.next_chunk()
-                if status:
-                    progress = int(status.progress() * 100)
-                    print(f"  Uploaded {progress}%")
-            except HttpError as e:
-                if e.resp.status == 403 and "quotaExceeded" in str(e):
-                    raise QuotaExceededError(
-                        "YouTube API quota exceeded. "
-                        "Quota resets at midnight Pacific Time."
-                    )
-                if e.resp.status in RETRIABLE_STATUS_CODES:
-                    error = f"Retriable HTTP error {e.resp.status}: {e.content}"
-                else:
-                    raise UploadFailedError(f"HTTP error {e.resp.status}: {e.content}")
-            except RETRIABLE_EXCEPTIONS as e:
-                error = f"Retriable error: {e}"
-
-            if error:
-                retry += 1
-                if retry > MAX_RETRIES:
-                    raise UploadFailedError(f"Max retries exceeded: {error}")
-
-                sleep_seconds = random.random() * (2**retry)
-                print(f"  Retry {retry}/{MAX_RETRIES} in {sleep_seconds:.1f}s...")
-                time.sleep(sleep_seconds)
-                error = None
+                status, response = self._send(request)
+            except (HttpError, *RETRIABLE_EXCEPTIONS) as e:
+                if new_request is not None and restarts < MAX_SESSION_RESTARTS and self._session_expired(e):
+                    restarts += 1
+                    print(f"  Upload session expired ({e.resp.status}), starting a new one...")
+                    request = new_request()
+                    continue
+                error = self._retriable_error(e)
+                time.sleep(self._backoff(retries, e, error))
+                continue
+
+            # A chunk got through, so later hiccups start from a short delay
+            retries = {"http": 0, "network": 0}
+            report_progress(status)
+
+        return response
+
+    async def _resumable_upload_async(
+        self, request, new_request=None, progress_callback=None
+    ) -> dict:
+        """
+        Async version of _resumable_upload.
+
+        Chunks are sent with asyncio.to_thread and backoff uses asyncio.sleep,
+        so the event loop thread is free while this upload waits.
+        """
+        report_progress = self._progress_reporter(progress_callback)
+        response = None
+        retries = {"http": 0, "network": 0}
+        restarts = 0
+
+        while response is None:
+            try:
+                status, response = await asyncio.to_thread(self._send, request)
+            except (HttpError, *RETRIABLE_EXCEPTIONS) as e:
+                if new_request is not None and restarts < MAX_SESSION_RESTARTS and self._session_expired(e):
+                    restarts += 1
+                    print(f"  Upload session expired ({e.resp.status}), starting a new one...")
+                    request = new_request()
+                    continue
+                error = self._retriable_error(e)
+                await asyncio.sleep(self._backoff(retries, e, error))
+                continue
+
+            # A chunk got through, so later hiccups start from a short delay
+            retries = {"http": 0, "network": 0}
+            report_progress(status)
 
         return response
 
@@ -181,6 +687,9 @@ def upload_video(
     privacy_status: str = "unlisted",
     made_for_kids: bool = False,
     youtube_service=None,
+    chunksize: int | None = None,
+    progress_callback: Callable[[float], None] | None = None,
+    thumbnail_path: str | None = None,
 ) -> dict:
     """
     Convenience function to upload a video.
@@ -193,12 +702,19 @@ def upload_video(
         category_id: YouTube category ID (17 = Sports)
         privacy_status: public, private, or unlisted
         made_for_kids: Whether video is made for kids
-        youtube_service: Optional authenticated YouTube service
+        youtube_service: Optional authenticated YouTube service (otherwise
+            this thread's shared uploader is used, keeping its adapted chunk size)
+        chunksize: Bytes per resumable request (optional)
+        progress_callback: Called with the fraction uploaded (0-1) after each chunk
+        thumbnail_path: Image to set as the custom thumbnail (optional)
 
     Returns:
         dict with video_id and url
     """
-    uploader = YouTubeUploader(youtube_service)
+    if youtube_service is None:
+        uploader = get_shared_uploader()
+    else:
+        uploader = YouTubeUploader(youtube_service)
     return uploader.upload(
         video_path=video_path,
         title=title,
@@ -207,4 +723,46 @@ def upload_video(
         category_id=category_id,
         privacy_status=privacy_status,
         made_for_kids=made_for_kids,
+        chunksize=chunksize,
+        progress_callback=progress_callback,
+        thumbnail_path=thumbnail_path,
+    )
+
+
+async def upload_video_async(youtube_service=None, **kwargs) -> dict:
+    """
+    Upload a video without blocking the event loop.
+
+    Takes the same keyword arguments as upload_video. Without a
+    youtube_service, each call builds its own, since uploads running at the
+    same time can't share one httplib2 connection.
+    """
+    if youtube_service is None:
+        youtube_service = await asyncio.to_thread(get_authenticated_service)
+    return await YouTubeUploader(youtube_service).upload_async(**kwargs)
+
+
+async def upload_many(
+    specs: list[dict],
+    max_concurrent: int = MAX_CONCURRENT_UPLOADS,
+) -> list:
+    """
+    Upload several independent videos concurrently.
+
+    Args:
+        specs: One dict of upload_video keyword arguments per video
+        max_concurrent: Maximum uploads in flight at once
+
+    Returns:
+        A list in the same order as specs, holding each upload's result dict,
+        or the exception it raised so one failure doesn't abandon the rest
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def upload_one(spec: dict) -> dict:
+        async with semaphore:
+            return await upload_video_async(**spec)
+
+    return await asyncio.gather(
+        *(upload_one(spec) for spec in specs), return_exceptions=True
     )